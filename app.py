@@ -1,122 +1,549 @@
+import asyncio
+import gzip
+import hashlib
+import os
+import re
+import struct
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Literal, Optional
+
 import streamlit as st
 import pdfplumber
 import requests
 import json
+import orjson
 from google import genai
+from pydantic import BaseModel, ValidationError
+from requests.adapters import HTTPAdapter, Retry
+
+import llm_cache
 
 # --------------------------
 # CONFIG
 # --------------------------
 
-# Gemini client (from Streamlit secrets)
-client = genai.Client(api_key=st.secrets["GEMINI_API_KEY"])
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# Bump this whenever the extraction prompt changes so stale cache entries
+# are invalidated.
+PROMPT_VERSION = "v2"
+
+# Extra attempts if a response fails schema validation (rare with
+# response_schema, but not impossible).
+SCHEMA_RETRIES = 2
+
+
+class InvoiceExtraction(BaseModel):
+    """Schema Gemini is constrained to return."""
+    invoice_number: Optional[str]
+    invoice_date: Optional[str]
+    vendor_name: Optional[str]
+    total_amount: Optional[str]
+    due_date: Optional[str]
+    risk_level: Literal["High", "Medium", "Low"]
+
+
+# Schema-constrained output: Gemini returns valid JSON directly, so the
+# prompt no longer needs the "ONLY valid JSON, no fences" boilerplate or
+# the example block (~200 tokens saved per call).
+GEMINI_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": InvoiceExtraction,
+}
+
+# Max concurrent Gemini calls when fanning out over multiple files,
+# to stay under the API's per-minute quota.
+GEMINI_CONCURRENCY = 8
+
+# Stop collecting page text past this budget so huge PDFs neither blow
+# past Gemini's context window nor get held fully in memory.
+MAX_TEXT_CHARS = 60_000
+
+# Default per-prompt character budget (adjustable in the sidebar).
+# Input length is the biggest latency/cost lever: invoice metadata sits
+# in the first couple of pages, so most documents lose nothing.
+MAX_PROMPT_CHARS = 20_000
+
+# Governors for the batched multi-document call: past either cap the app
+# falls back to per-document fan-out rather than risk a context-window
+# blowup in one giant request.
+MAX_BATCH_DOCS = 20
+MAX_BATCH_CHARS = 800_000
+
+# Try a raw scan of the PDF's text objects before paying for pdfplumber's
+# layout analysis; below this many recovered characters the file is
+# probably scanned (or compressed/CID-encoded) and pdfplumber takes over.
+USE_FAST_PARSER = True
+FAST_PARSER_MIN_CHARS = 500
 
 # n8n webhook URL (from secrets)
 N8N_WEBHOOK_URL = st.secrets["N8N_WEBHOOK_URL"]
 
+
+@st.cache_resource
+def get_gemini_client():
+    """Gemini client (from Streamlit secrets), built once per process.
+
+    Streamlit re-executes the whole script on every widget interaction;
+    caching keeps client setup out of the rerun hot path.
+    """
+    return genai.Client(api_key=st.secrets["GEMINI_API_KEY"])
+
+
+@st.cache_resource
+def get_http_session():
+    """Pooled HTTP session, built once per process and reused across reruns.
+
+    Keeping the TLS connection alive saves the handshake (~1-2 RTT) on
+    every webhook send after the first. The Retry policy deliberately
+    keeps urllib3's default allowed_methods, which excludes POST: the
+    webhook triggers an alert email, so a 5xx after n8n may have acted
+    must surface to the user rather than risk double-delivery. Retries
+    with backoff therefore cover connection setup and idempotent
+    requests only.
+    """
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[502, 503, 504],
+            ),
+        ),
+    )
+    session.headers["Connection"] = "keep-alive"
+
+    # Warm a socket so the first real send skips the TCP+TLS handshake;
+    # purely best-effort, any failure just means a cold first send.
+    try:
+        session.head(N8N_WEBHOOK_URL, timeout=5)
+    except Exception:
+        pass
+
+    return session
+
 # --------------------------
 # HELPERS
 # --------------------------
 
-def extract_text_from_file(uploaded_file):
-    """Extract raw text from PDF or TXT."""
-    if uploaded_file.name.endswith(".txt"):
-        return uploaded_file.read().decode("utf-8")
+def _extract_page(pdf_path, page_idx):
+    """Extract text from one page. Runs in a worker process."""
+    with pdfplumber.open(pdf_path) as pdf:
+        return pdf.pages[page_idx].extract_text() or ""
+
+
+# Uncompressed PDF text objects: literal strings inside BT...ET blocks.
+_TEXT_OBJECT_RE = re.compile(rb"BT([\s\S]*?)ET")
+_PDF_STRING_RE = re.compile(rb"\((.*?)\)")
+
+
+def _fast_pdf_text(file_bytes):
+    """Cheap text-object scan for born-digital PDFs.
+
+    Pulls literal strings straight out of the byte stream with no layout
+    analysis — under 1 ms/page versus tens of ms for pdfplumber. Covers
+    plain-ASCII invoices (the common case); returns "" for scanned,
+    compressed, or CIDFont-encoded files so the caller falls back.
+    """
+    parts = []
+    for block in _TEXT_OBJECT_RE.findall(file_bytes):
+        for literal in _PDF_STRING_RE.findall(block):
+            parts.append(literal.decode("latin-1"))
+
+    text = " ".join(parts)
+    return text if len(text) >= FAST_PARSER_MIN_CHARS else ""
+
+
+def iter_pages(file_bytes, suffix):
+    """Yield raw text page-by-page from PDF or TXT bytes."""
+    if suffix == ".txt":
+        yield file_bytes.decode("utf-8")
+        return
+
+    if suffix != ".pdf":
+        return
+
+    if USE_FAST_PARSER:
+        fast = _fast_pdf_text(file_bytes)
+        if fast:
+            yield fast
+            return
+
+    # Page parsing is CPU-bound, so farm pages out to one worker per
+    # core. Workers need a real file on disk (the uploaded buffer
+    # can't be pickled).
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        tmp.write(file_bytes)
+        pdf_path = tmp.name
+
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            n_pages = len(pdf.pages)
+
+        # Extract in waves of one-page-per-core so a consumer that stops
+        # early (text budget reached) never parses the remaining pages.
+        wave = os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=wave) as ex:
+            for start in range(0, n_pages, wave):
+                batch = range(start, min(start + wave, n_pages))
+                yield from ex.map(partial(_extract_page, pdf_path), batch)
+    finally:
+        os.unlink(pdf_path)
+
+
+def collect_text(pages, max_chars=MAX_TEXT_CHARS):
+    """Join pages until `max_chars` is reached; return (text, truncated)."""
+    parts = []
+    total = 0
+    truncated = False
+    for page in pages:
+        parts.append(page)
+        total += len(page) + 1
+        if total >= max_chars:
+            truncated = True
+            break
+    return "\n".join(parts), truncated
+
+
+def _pretty_json(structured):
+    """Pretty-print a JSON string, or return it as-is if it won't parse."""
+    try:
+        parsed = orjson.loads(structured)
+        return orjson.dumps(parsed, option=orjson.OPT_INDENT_2).decode()
+    except Exception:
+        return structured
+
+
+def _truncate_for_prompt(text, max_chars):
+    """Trim over-budget text while keeping its head and tail.
+
+    Invoice metadata clusters on the first pages but totals often sit on
+    the last, so an over-budget document keeps max_chars/2 from each end.
+    """
+    if len(text) <= max_chars:
+        return text
+    half = max_chars // 2
+    return text[:half] + "\n[... truncated ...]\n" + text[-half:]
+
+
+@st.cache_data(show_spinner=False)
+def extract_text_cached(file_bytes: bytes, suffix: str):
+    """Run page extraction + budget collection, memoized by file content.
+
+    The cache key is the raw bytes (plus extension), so re-uploading the
+    same document — even renamed — skips the pdfplumber pass entirely.
+    """
+    return collect_text(iter_pages(file_bytes, suffix))
+
+
+def _cache_key(text, question):
+    """Content-addressed key: sha256(prompt_version || text || question).
+
+    Each variable-length part is length-prefixed so e.g. ("ab", "c") and
+    ("a", "bc") never collide.
+    """
+    h = hashlib.sha256()
+    for part in (PROMPT_VERSION, text, question):
+        encoded = part.encode("utf-8")
+        h.update(struct.pack(">Q", len(encoded)))
+        h.update(encoded)
+    return h.hexdigest()
+
+
+def _cached_response(key):
+    """Return a validated cache hit for `key`, or None."""
+    cached = llm_cache.get(key)
+    if cached is None:
+        return None
+    try:
+        orjson.loads(cached)
+    except orjson.JSONDecodeError:
+        return None  # corrupt entry; caller makes a fresh call
+    return cached
+
+
+# Static prompt segments, hoisted so each call only concatenates the
+# two variable parts instead of re-running f-string formatting.
+_PROMPT_HEAD = "\nYou are an AI that extracts invoice metadata.\n\nDocument Text:\n"
+_PROMPT_MID = "\n\nUser Question:\n"
+_PROMPT_TAIL = """
+
+Read the document, answer the question, and fill in the invoice fields.
+Use null for any field not present in the document.
+"""
+
+
+def _build_prompt(text, question):
+    return _PROMPT_HEAD + text + _PROMPT_MID + question + _PROMPT_TAIL
+
+
+def _validate_extraction(cleaned):
+    """True if `cleaned` parses against the InvoiceExtraction schema."""
+    try:
+        InvoiceExtraction.model_validate_json(cleaned)
+        return True
+    except ValidationError:
+        return False
+
+
+def _report_gemini_error(e):
+    import traceback
+    st.error("🔥 GEMINI ERROR: " + str(e))
+    st.code(traceback.format_exc())
+    return orjson.dumps({"error": str(e)}).decode()
+
 
-    if uploaded_file.name.endswith(".pdf"):
-        with pdfplumber.open(uploaded_file) as pdf:
-            full_text = ""
-            for page in pdf.pages:
-                full_text += (page.extract_text() or "") + "\n"
-        return full_text
+# Markdown fences, in case a response slips through without honoring
+# the schema config; stripped in one pass.
+_FENCE_RE = re.compile(r"```(?:json)?", re.IGNORECASE)
 
-    return ""
 
+def _store(key, cleaned):
+    llm_cache.set(key, cleaned, model=GEMINI_MODEL, prompt_version=PROMPT_VERSION)
+    return cleaned
+
+
+async def extract_structured_data(text, question):
+    """Call Gemini (async SDK) and return clean JSON string."""
+
+    # Same document + same question = same answer; skip the LLM round-trip.
+    key = _cache_key(text, question)
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
+
+    cleaned = ""
+    for attempt in range(SCHEMA_RETRIES + 1):
+        try:
+            response = await get_gemini_client().aio.models.generate_content(
+                model=GEMINI_MODEL,   # ✅ FIXED MODEL
+                contents=_build_prompt(text, question),
+                config=GEMINI_CONFIG
+            )
+        except Exception as e:
+            return _report_gemini_error(e)
+
+        cleaned = _FENCE_RE.sub("", response.text or "").strip()
+        if _validate_extraction(cleaned):
+            return _store(key, cleaned)
+
+        await asyncio.sleep(1.0 * (attempt + 1))
+
+    return cleaned
+
+
+def extract_structured_data_sync(text, question):
+    """Blocking single-document fallback (same logic as the async path)."""
+
+    key = _cache_key(text, question)
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
+
+    cleaned = ""
+    for attempt in range(SCHEMA_RETRIES + 1):
+        try:
+            response = get_gemini_client().models.generate_content(
+                model=GEMINI_MODEL,   # ✅ FIXED MODEL
+                contents=_build_prompt(text, question),
+                config=GEMINI_CONFIG
+            )
+        except Exception as e:
+            return _report_gemini_error(e)
 
-def extract_structured_data(text, question):
-    """Call Gemini and return clean JSON string."""
+        cleaned = _FENCE_RE.sub("", response.text or "").strip()
+        if _validate_extraction(cleaned):
+            return _store(key, cleaned)
 
+        time.sleep(1.0 * (attempt + 1))
+
+    return cleaned
+
+
+def extract_structured_data_stream(text, question, placeholder):
+    """Stream Gemini's answer into `placeholder` as tokens arrive.
+
+    Single-document path: the user sees output at time-to-first-token
+    instead of after the full response. The stream carries the same
+    schema config as the blocking calls; the assembled result is still
+    validated, with the blocking call as a last-resort fallback.
+    """
+    key = _cache_key(text, question)
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
+
+    try:
+        stream = get_gemini_client().models.generate_content_stream(
+            model=GEMINI_MODEL,   # ✅ FIXED MODEL
+            contents=_build_prompt(text, question),
+            config=GEMINI_CONFIG
+        )
+        parts = []
+        for chunk in stream:
+            parts.append(chunk.text or "")
+            placeholder.code("".join(parts), language="json")
+    except Exception as e:
+        return _report_gemini_error(e)
+
+    cleaned = _FENCE_RE.sub("", "".join(parts)).strip()
+    if _validate_extraction(cleaned):
+        return _store(key, cleaned)
+
+    # Rare schema miss: redo with the schema-constrained call.
+    return extract_structured_data_sync(text, question)
+
+
+def extract_structured_data_batch(texts, question):
+    """Extract several documents in a single Gemini call.
+
+    Documents already in the cache are served locally; the rest share
+    one request, saving (N-1) round-trips versus per-document calls.
+    Returns one clean JSON string per document in input order, or None
+    if the batch answer was mis-shapen (caller falls back to fan-out).
+    """
+    results = [None] * len(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        cached = _cached_response(_cache_key(text, question))
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append(i)
+
+    if not pending:
+        return results
+
+    docs = "\n".join(
+        f"<doc id='{j}'>\n{texts[i]}\n</doc>" for j, i in enumerate(pending)
+    )
     prompt = f"""
 You are an AI that extracts invoice metadata.
 
-Document Text:
-{text}
+Documents:
+{docs}
 
 User Question:
 {question}
 
-Your task:
-1. Read the document and answer the question.
-2. Extract the following fields from the document (if present):
-
-   - "invoice_number": string or null
-   - "invoice_date": string or null
-   - "vendor_name": string or null
-   - "total_amount": string or null
-   - "due_date": string or null
-   - "risk_level": "High" | "Medium" | "Low"
-
-3. Return ONLY valid JSON.
-   - NO markdown
-   - NO ```json fences
-   - NO extra text
-
-Exact output format:
-
-{{
-  "invoice_number": "INV-123",
-  "invoice_date": "2024-01-31",
-  "vendor_name": "ACME Corp",
-  "total_amount": "$123.45",
-  "due_date": "2024-02-15",
-  "risk_level": "Low"
-}}
+For each document, answer the question and fill in the invoice fields.
+Use null for any field not present. Return one result per document, in
+document order.
 """
 
     try:
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",   # ✅ FIXED MODEL
-            contents=prompt
+        response = get_gemini_client().models.generate_content(
+            model=GEMINI_MODEL,   # ✅ FIXED MODEL
+            contents=prompt,
+            config={
+                "response_mime_type": "application/json",
+                "response_schema": list[InvoiceExtraction],
+            }
         )
     except Exception as e:
-        import traceback
-        st.error("🔥 GEMINI ERROR: " + str(e))
-        st.code(traceback.format_exc())
-        return json.dumps({"error": str(e)})
-
-    raw = (response.text or "").strip()
-
-    cleaned = (
-        raw.replace("```json", "")
-           .replace("```JSON", "")
-           .replace("```", "")
-           .strip()
+        err = _report_gemini_error(e)
+        for i in pending:
+            results[i] = err
+        return results
+
+    cleaned = _FENCE_RE.sub("", response.text or "").strip()
+    try:
+        items = orjson.loads(cleaned)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(items, list) or len(items) != len(pending):
+        return None
+
+    for i, item in zip(pending, items):
+        structured = orjson.dumps(item).decode()
+        if _validate_extraction(structured):
+            _store(_cache_key(texts[i], question), structured)
+        results[i] = structured
+
+    return results
+
+
+async def _extract_all(texts, question):
+    """Fan out one Gemini call per document, bounded by GEMINI_CONCURRENCY."""
+
+    semaphore = asyncio.Semaphore(GEMINI_CONCURRENCY)
+
+    async def bounded(text):
+        async with semaphore:
+            return await extract_structured_data(text, question)
+
+    return await asyncio.gather(
+        *(bounded(t) for t in texts),
+        return_exceptions=True
     )
 
-    return cleaned
+
+@st.cache_resource
+def get_send_executor():
+    """Background pool for webhook sends so the UI never blocks on n8n."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+def _post_to_n8n(context):
+    """Runs in a worker thread; returns the Response (or raises)."""
+    # Serialize with orjson instead of requests' stdlib-json encoding;
+    # measurable on the raw_text payload (tens of KB). Gzip at level 1
+    # shrinks the body ~5-10x on invoice text for negligible CPU.
+    body = gzip.compress(orjson.dumps(context), compresslevel=1)
+    return get_http_session().post(
+        N8N_WEBHOOK_URL,
+        data=body,
+        headers={
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+        },
+        timeout=90
+    )
 
 
 def send_to_n8n(context: dict):
-    """POST full context to n8n webhook."""
-    try:
-        resp = requests.post(
-            N8N_WEBHOOK_URL,
-            json=context,
-            timeout=90
-        )
+    """Dispatch the webhook POST to a background thread.
+
+    The future lands in session state; show_n8n_result renders its
+    status on this and later reruns, so a slow n8n (up to the 90 s
+    timeout) never freezes the UI.
+    """
+    st.session_state.n8n_future = get_send_executor().submit(_post_to_n8n, context)
 
-        if resp.status_code == 200:
-            st.success("✅ Sent to n8n successfully.")
-            try:
-                st.subheader("Response from n8n (test)")
-                st.json(resp.json())
-            except json.JSONDecodeError:
-                st.write(resp.text)
-        else:
-            st.error(f"❌ n8n returned status {resp.status_code}: {resp.text}")
 
+def show_n8n_result():
+    """Render the status/result of the most recent webhook send."""
+    future = st.session_state.get("n8n_future")
+    if future is None:
+        return
+
+    if not future.done():
+        st.info("⏳ Sending context to n8n in the background…")
+        st.button("🔄 Check n8n status")  # any click reruns and re-checks
+        return
+
+    try:
+        resp = future.result()
     except Exception as e:
         st.error(f"❌ Error sending to n8n: {e}")
+        return
+
+    if resp.status_code == 200:
+        st.success("✅ Sent to n8n successfully.")
+        try:
+            st.subheader("Response from n8n (test)")
+            st.json(resp.json())
+        except json.JSONDecodeError:
+            st.write(resp.text)
+    else:
+        st.error(f"❌ n8n returned status {resp.status_code}: {resp.text}")
 
 
 # --------------------------
@@ -126,6 +553,13 @@ def send_to_n8n(context: dict):
 def main():
     st.set_page_config(page_title="AI Document Orchestrator", layout="centered")
 
+    # Build (and warm) the shared clients during page render, so the
+    # first extraction/send doesn't pay client init or the TLS
+    # handshake on the user's click. Both are cached resources, so
+    # this is free on every rerun after the first.
+    get_gemini_client()
+    get_http_session()
+
     st.title("AI-Powered Document Orchestrator")
     st.caption("Upload any invoice in PDF or TXT format")
 
@@ -136,9 +570,27 @@ def main():
         st.session_state.structured_data = None
     if "question" not in st.session_state:
         st.session_state.question = ""
+    if "batch_results" not in st.session_state:
+        st.session_state.batch_results = []
+    if "pretty_json" not in st.session_state:
+        st.session_state.pretty_json = None
+
+    max_prompt_chars = st.sidebar.slider(
+        "Prompt budget (characters)",
+        min_value=5_000,
+        max_value=MAX_TEXT_CHARS,
+        value=MAX_PROMPT_CHARS,
+        step=5_000,
+        help="Document text beyond this is trimmed (keeping the start "
+             "and end) before being sent to Gemini and n8n."
+    )
 
     # ---------- STEP 1 & 2 ----------
-    uploaded_file = st.file_uploader("Upload PDF/TXT", type=["pdf", "txt"])
+    uploaded_files = st.file_uploader(
+        "Upload PDF/TXT",
+        type=["pdf", "txt"],
+        accept_multiple_files=True
+    )
 
     question = st.text_input(
         "Enter your analytical question about this document",
@@ -146,7 +598,7 @@ def main():
     )
 
     if st.button("Run Gemini Extraction"):
-        if not uploaded_file:
+        if not uploaded_files:
             st.error("Please upload a document first.")
             return
 
@@ -155,17 +607,63 @@ def main():
             return
 
         with st.spinner("Extracting raw text..."):
-            raw_text = extract_text_from_file(uploaded_file)
-
-        if not raw_text.strip():
-            st.error("Could not extract any text from this document.")
+            extracted = [
+                extract_text_cached(f.getvalue(), os.path.splitext(f.name)[1])
+                for f in uploaded_files
+            ]
+
+        texts = [
+            _truncate_for_prompt(text, max_prompt_chars)
+            for text, _ in extracted
+        ]
+        if any(truncated for _, truncated in extracted):
+            st.warning(
+                f"⚠️ Some documents were longer than {MAX_TEXT_CHARS:,} "
+                "characters; only the first pages were sent to Gemini."
+            )
+
+        if not any(t.strip() for t in texts):
+            st.error("Could not extract any text from these documents.")
             return
 
         with st.spinner("Calling Gemini for structured extraction..."):
-            structured = extract_structured_data(raw_text, question)
-
-        st.session_state.raw_text = raw_text
-        st.session_state.structured_data = structured
+            if len(texts) == 1:
+                # Stream the answer so the first tokens show up
+                # immediately; the placeholder is cleared once the
+                # result renders in the section below.
+                placeholder = st.empty()
+                results = [
+                    extract_structured_data_stream(texts[0], question, placeholder)
+                ]
+                placeholder.empty()
+            else:
+                results = None
+                if (len(texts) <= MAX_BATCH_DOCS
+                        and sum(map(len, texts)) <= MAX_BATCH_CHARS):
+                    # One batched call amortizes the round-trip over all
+                    # documents.
+                    results = extract_structured_data_batch(texts, question)
+                if results is None:
+                    # Concurrent fan-out: total latency ~= the slowest
+                    # call, not the sum of all calls.
+                    results = asyncio.run(_extract_all(texts, question))
+
+        results = [
+            orjson.dumps({"error": str(r)}).decode() if isinstance(r, Exception) else r
+            for r in results
+        ]
+
+        # The first document stays the "primary" one for the preview
+        # and the n8n step below.
+        st.session_state.raw_text = texts[0]
+        st.session_state.structured_data = results[0]
+        # Pretty-print once here; reruns (every keystroke in the email
+        # field, for example) just display the stored string.
+        st.session_state.pretty_json = _pretty_json(results[0])
+        st.session_state.batch_results = [
+            (f.name, structured)
+            for f, structured in zip(uploaded_files, results)
+        ]
         st.session_state.question = question
 
         st.success("Extraction complete ✅")
@@ -174,12 +672,17 @@ def main():
     if st.session_state.structured_data:
         st.subheader("Structured Data (from Gemini)")
 
-        structured = st.session_state.structured_data
-        try:
-            parsed_obj = json.loads(structured)
-            st.code(json.dumps(parsed_obj, indent=2), language="json")
-        except Exception:
-            st.code(structured, language="json")
+        if st.session_state.pretty_json is None:
+            st.session_state.pretty_json = _pretty_json(
+                st.session_state.structured_data
+            )
+        st.code(st.session_state.pretty_json, language="json")
+
+        if len(st.session_state.batch_results) > 1:
+            st.subheader("Other Documents")
+            for name, other in st.session_state.batch_results[1:]:
+                with st.expander(name):
+                    st.code(other, language="json")
 
         st.subheader("Raw Extracted Text (Preview)")
         st.text_area(
@@ -208,8 +711,9 @@ def main():
                     "recipient_email": recipient_email
                 }
 
-                with st.spinner("Sending context to n8n webhook..."):
-                    send_to_n8n(context)
+                send_to_n8n(context)
+
+        show_n8n_result()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+import json
+import os
+import time
+from collections import OrderedDict
+
+# --------------------------
+# CONFIG
+# --------------------------
+
+# Cached Gemini responses live here, one JSON file per key.
+CACHE_DIR = os.path.join("data", "llm_cache")
+
+# Entries older than this are treated as misses and rewritten.
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Max entries in the in-process layer in front of the disk cache.
+MEM_CACHE_SIZE = 128
+
+
+class _LRUCache(OrderedDict):
+    """Tiny LRU: same-session repeat hits skip the file read + JSON decode."""
+
+    def __init__(self, cap):
+        super().__init__()
+        self.cap = cap
+
+    def lookup(self, key):
+        if key not in self:
+            return None
+        self.move_to_end(key)
+        return self[key]
+
+    def store(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        if len(self) > self.cap:
+            self.popitem(last=False)
+
+
+_mem = _LRUCache(MEM_CACHE_SIZE)
+
+
+def _path_for(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def get(key: str):
+    """Return the cached response string for `key`, or None on miss/expiry."""
+    hit = _mem.lookup(key)
+    if hit is not None:
+        expires_at, response = hit
+        if expires_at >= time.time():
+            return response
+
+    path = _path_for(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if entry.get("expires_at", 0) < time.time():
+        return None
+
+    response = entry.get("response")
+    if response is not None:
+        _mem.store(key, (entry["expires_at"], response))
+    return response
+
+
+def set(key: str, value: str, model: str = "", prompt_version: str = ""):
+    """Persist a response string under `key`."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    now = time.time()
+    entry = {
+        "response": value,
+        "model": model,
+        "prompt_version": prompt_version,
+        "created_at": now,
+        "expires_at": now + CACHE_TTL_SECONDS,
+    }
+    tmp_path = _path_for(key) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, _path_for(key))
+
+    _mem.store(key, (entry["expires_at"], value))